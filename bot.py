@@ -6,17 +6,23 @@
 #   Python 3.10+
 
 import asyncio
+import bisect
+import logging
+import logging.handlers
 import os
-import datetime
+import queue
 import random
+from functools import lru_cache
+from time import monotonic
 from typing import Optional, List
-from threading import Thread # Added for Flask
+from urllib.parse import urlparse
 
 import discord
+from aiohttp import web
+from cachetools import TTLCache
 from discord.ext import commands
 from discord.ui import Button, View, Select
 from dotenv import load_dotenv
-from flask import Flask # Added for Flask
 
 # --- DATABASE IMPORTS ---
 import asyncpg
@@ -24,6 +30,16 @@ import asyncpg
 # CONFIG
 # =========================
 
+# Route log records through a queue so emission never blocks the event loop on
+# stdout flushes — the listener thread does the actual I/O.
+_log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(_log_queue)])
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+log = logging.getLogger("questbot")
+
 # It is highly recommended to load the token from the environment variable (Render)
 load_dotenv()
 TOKEN = os.environ.get("TOKEN") or "" # Fallback, but use ENV on Render!
@@ -48,6 +64,141 @@ bot = commands.Bot(command_prefix=PREFIX, intents=intents, help_command=None)
 # =========================
 db_pool: asyncpg.Pool = None
 
+# Startup DDL batched into multi-statement strings so schema setup is two
+# protocol round trips inside one transaction instead of a dozen.
+# PostgreSQL uses BIGINT for large integers (Discord IDs) and SERIAL for auto-increment.
+_TABLES_DDL = """
+    CREATE TABLE IF NOT EXISTS users (
+        user_id BIGINT PRIMARY KEY,
+        points  INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE TABLE IF NOT EXISTS tasks (
+        id              SERIAL PRIMARY KEY,
+        title           TEXT NOT NULL,
+        points          INTEGER NOT NULL,
+        max_submissions INTEGER NOT NULL,
+        archived        INTEGER NOT NULL DEFAULT 0,
+        role_reward_id  BIGINT,
+        daily_flag      INTEGER NOT NULL DEFAULT 0,
+        type            TEXT NOT NULL DEFAULT 'link',
+        task_link       TEXT,
+        announcement_message_id BIGINT
+    );
+
+    CREATE TABLE IF NOT EXISTS submissions (
+        id            SERIAL PRIMARY KEY,
+        user_id       BIGINT NOT NULL,
+        task_id       INTEGER NOT NULL REFERENCES tasks(id),
+        proof         TEXT CHECK (length(proof) <= 2000),
+        status        TEXT NOT NULL DEFAULT 'pending',
+        created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        reviewed_at   TIMESTAMP
+    );
+
+    -- Keep large proofs TOASTed out of line so the main heap stays compact
+    -- for the review-queue scans.
+    ALTER TABLE submissions ALTER COLUMN proof SET STORAGE EXTENDED;
+
+    CREATE TABLE IF NOT EXISTS withdrawals (
+        id              SERIAL PRIMARY KEY,
+        user_id         BIGINT NOT NULL,
+        bank_name       TEXT NOT NULL,
+        account_number  TEXT NOT NULL,
+        account_name    TEXT NOT NULL,
+        points          INTEGER NOT NULL,
+        status          TEXT NOT NULL DEFAULT 'pending',
+        created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TABLE IF NOT EXISTS banned_users (
+        user_id BIGINT PRIMARY KEY
+    );
+"""
+
+# Indexes so the hot filters stay b-tree probes instead of sequential scans as
+# submissions/withdrawals grow. The partial indexes cover the review queue and
+# pending-withdrawal views: ix_subs_pending turns the status='pending' counts
+# and lists into index-only scans over just the pending minority, while
+# ix_subs_task_status covers the generic per-task GROUP BY (status rides
+# along in the key, so no INCLUDE column is needed). leaderboard_mv serves
+# rank lookups; its unique index is required for REFRESH ... CONCURRENTLY.
+_INDEX_DDL = """
+    CREATE INDEX IF NOT EXISTS ix_subs_user_task_status ON submissions(user_id, task_id, status);
+    CREATE INDEX IF NOT EXISTS ix_subs_task_status ON submissions(task_id, status);
+    CREATE INDEX IF NOT EXISTS ix_subs_user_status ON submissions(user_id, status);
+    CREATE INDEX IF NOT EXISTS ix_subs_pending ON submissions(task_id) WHERE status='pending';
+    CREATE INDEX IF NOT EXISTS ix_subs_pending_id ON submissions(id) WHERE status='pending';
+    CREATE INDEX IF NOT EXISTS ix_wd_user_status ON withdrawals(user_id, status);
+    CREATE INDEX IF NOT EXISTS ix_wd_pending ON withdrawals(created_at) WHERE status='pending';
+    CREATE INDEX IF NOT EXISTS ix_tasks_active ON tasks(id) WHERE archived=0;
+
+    CREATE MATERIALIZED VIEW IF NOT EXISTS leaderboard_mv AS
+    SELECT user_id, points, RANK() OVER (ORDER BY points DESC) AS rank
+    FROM users
+    WITH DATA;
+
+    CREATE UNIQUE INDEX IF NOT EXISTS ix_lbmv_user ON leaderboard_mv(user_id);
+    CREATE INDEX IF NOT EXISTS ix_lbmv_rank ON leaderboard_mv(rank);
+"""
+
+# Triggers publishing cache-invalidation events over LISTEN/NOTIFY so the
+# in-process caches (points, bans, tasks) stay coherent if more than one bot
+# instance writes to the same database. Idle cost is zero; each instance also
+# hears its own writes, which the handlers tolerate.
+_NOTIFY_DDL = """
+    CREATE OR REPLACE FUNCTION notify_cache_invalidate() RETURNS trigger LANGUAGE plpgsql AS $$
+    BEGIN
+        IF TG_TABLE_NAME = 'users' THEN
+            PERFORM pg_notify('cache_invalidate', 'points:' || NEW.user_id);
+            RETURN NEW;
+        ELSIF TG_TABLE_NAME = 'banned_users' THEN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM pg_notify('cache_invalidate', 'ban:' || NEW.user_id);
+                RETURN NEW;
+            ELSE
+                PERFORM pg_notify('cache_invalidate', 'unban:' || OLD.user_id);
+                RETURN OLD;
+            END IF;
+        ELSIF TG_TABLE_NAME = 'tasks' THEN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('cache_invalidate', 'task:' || OLD.id);
+                RETURN OLD;
+            ELSE
+                PERFORM pg_notify('cache_invalidate', 'task:' || NEW.id);
+                RETURN NEW;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END $$;
+
+    DROP TRIGGER IF EXISTS users_cache_notify ON users;
+    CREATE TRIGGER users_cache_notify AFTER UPDATE ON users
+        FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidate();
+
+    DROP TRIGGER IF EXISTS banned_cache_notify ON banned_users;
+    CREATE TRIGGER banned_cache_notify AFTER INSERT OR DELETE ON banned_users
+        FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidate();
+
+    DROP TRIGGER IF EXISTS tasks_cache_notify ON tasks;
+    CREATE TRIGGER tasks_cache_notify AFTER INSERT OR UPDATE OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION notify_cache_invalidate();
+"""
+
+# Backend PIDs of this process's pool connections. The cache_invalidate
+# triggers fire for our own writes too, and the NOTIFY carries the writing
+# backend's PID — tracking our PIDs lets the listener drop those echoes
+# instead of evicting entries the write path just primed. Notifications from
+# other instances keep flowing; their PIDs are never in this set.
+_POOL_PIDS: set[int] = set()
+
+
+async def _track_backend_pid(conn):
+    pid = conn.get_server_pid()
+    _POOL_PIDS.add(pid)
+    conn.add_termination_listener(lambda _conn: _POOL_PIDS.discard(pid))
+
+
 async def init_db():
     global db_pool
     
@@ -59,7 +210,7 @@ async def init_db():
     DB_NAME = os.environ.get("DB_NAME")
     
     if not all([DB_USER, DB_PASS, DB_HOST, DB_PORT, DB_NAME]):
-        print("FATAL: One or more individual DB environment variables (DB_USER, DB_PASS, etc.) are not set.")
+        log.critical("One or more individual DB environment variables (DB_USER, DB_PASS, etc.) are not set.")
         return
 
     # Construct the DATABASE_URL from individual components
@@ -67,123 +218,314 @@ async def init_db():
     # --- END: MODIFIED DB LOAD SECTION ---
 
     try:
-        # Create a connection pool to manage connections efficiently
-        db_pool = await asyncpg.create_pool(DATABASE_URL)
-        print("✅ Database pool created successfully.")
+        # Create a connection pool to manage connections efficiently.
+        # A large statement cache lets asyncpg reuse prepared statements for the
+        # hot helper queries instead of re-parsing the SQL text on every call:
+        # fetch/fetchval/execute transparently prepare each distinct query text
+        # once per connection and reuse it, so hand-managed conn.prepare()
+        # handles (e.g. via a pool setup= hook) would add bookkeeping without
+        # removing any parse/plan work. min/max sizing absorbs Discord command
+        # bursts; make sure Postgres max_connections leaves headroom for
+        # max_size across all instances.
+        db_pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=10,
+            max_size=50,
+            max_inactive_connection_lifetime=300,
+            max_queries=50000,
+            statement_cache_size=1024,
+            max_cached_statement_lifetime=0,
+            command_timeout=30,
+            init=_track_backend_pid,
+        )
+        log.info("✅ Database pool created successfully.")
 
         async with db_pool.acquire() as conn:
-            # Use execute for non-SELECT statements like CREATE TABLE
-            # PostgreSQL uses BIGINT for large integers (Discord IDs) and SERIAL for auto-increment.
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    user_id BIGINT PRIMARY KEY,
-                    points  INTEGER NOT NULL DEFAULT 0
-                )
-            """)
-
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id              SERIAL PRIMARY KEY,
-                    title           TEXT NOT NULL,
-                    points          INTEGER NOT NULL,
-                    max_submissions INTEGER NOT NULL,
-                    archived        INTEGER NOT NULL DEFAULT 0,
-                    role_reward_id  BIGINT,
-                    daily_flag      INTEGER NOT NULL DEFAULT 0,
-                    type            TEXT NOT NULL DEFAULT 'link',
-                    task_link       TEXT,
-                    announcement_message_id BIGINT
-                )
-            """)
-
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS submissions (
-                    id            SERIAL PRIMARY KEY,
-                    user_id       BIGINT NOT NULL,
-                    task_id       INTEGER NOT NULL REFERENCES tasks(id),
-                    proof         TEXT,
-                    status        TEXT NOT NULL DEFAULT 'pending',
-                    created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    reviewed_at   TIMESTAMP
-                )
-            """)
-
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS withdrawals (
-                    id              SERIAL PRIMARY KEY,
-                    user_id         BIGINT NOT NULL,
-                    bank_name       TEXT NOT NULL,
-                    account_number  TEXT NOT NULL,
-                    account_name    TEXT NOT NULL,
-                    points          INTEGER NOT NULL,
-                    status          TEXT NOT NULL DEFAULT 'pending',
-                    created_at      TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS banned_users (
-                    user_id BIGINT PRIMARY KEY
-                )
-            """)
-        print("✅ Database tables ensured.")
-
-    except Exception as e:
-        print(f"FATAL: Failed to connect or initialize database: {e}")
+            # One transaction, two multi-statement executes: atomic DDL and
+            # far fewer protocol round trips at startup.
+            async with conn.transaction():
+                await conn.execute(_TABLES_DDL)
+                await conn.execute(_INDEX_DDL)
+                await conn.execute(_NOTIFY_DDL)
+        log.info("✅ Database tables ensured.")
+
+    except Exception:
+        log.exception("FATAL: Failed to connect or initialize database")
         # The bot will likely not function without a database.
         await bot.close()
 
 
+LEADERBOARD_REFRESH_SECONDS = 60
+
+async def refresh_leaderboard_loop():
+    """Keep leaderboard_mv fresh; CONCURRENTLY avoids blocking readers."""
+    while True:
+        await asyncio.sleep(LEADERBOARD_REFRESH_SECONDS)
+        try:
+            await db_pool.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY leaderboard_mv")
+        except Exception as e:
+            log.exception("leaderboard refresh error: %s", e)
+
+
+POOL_STATS_SECONDS = 300
+
+async def pool_stats_loop():
+    """Periodically report pool utilisation so sizing problems show up in logs."""
+    while True:
+        await asyncio.sleep(POOL_STATS_SECONDS)
+        try:
+            log.info("db pool size=%d idle=%d", db_pool.get_size(), db_pool.get_idle_size())
+        except Exception as e:
+            log.exception("pool stats error: %s", e)
+
+
 # =========================
 # HELPERS (ASYNC)
 # =========================
-async def ensure_user(user_id: int) -> None:
-    async with db_pool.acquire() as conn:
-        # Use $1 for parameter substitution in asyncpg, and ON CONFLICT DO NOTHING for INSERT OR IGNORE
-        await conn.execute(
-            "INSERT INTO users (user_id, points) VALUES ($1, 0) ON CONFLICT (user_id) DO NOTHING", 
-            user_id
-        )
 
-async def get_user_points(user_id: int) -> int:
+# In-process TTL cache for the points lookup that runs on every command.
+# A short TTL keeps values fresh enough while skipping the Postgres round trip
+# on repeat hits; writes must call invalidate_points below.
+_POINTS_TTL = 5.0   # seconds
+_points_cache: dict[int, tuple[float, int]] = {}
+_points_cache_lock = asyncio.Lock()
+
+def invalidate_points(user_id: int) -> None:
+    """Drop the cached points for a user. Call after any UPDATE of users.points."""
+    _points_cache.pop(user_id, None)
+
+# Banned users are a small, append-mostly set — hold them fully in memory and
+# mutate the set alongside the banned_users writes, so the per-command ban
+# check never touches the DB at all.
+BANNED: set[int] = set()
+
+async def load_banned() -> None:
+    rows = await db_pool.fetch("SELECT user_id FROM banned_users")
+    BANNED.clear()
+    BANNED.update(r['user_id'] for r in rows)
+
+# Users seen this process lifetime. Rows are never deleted, so once the INSERT
+# has run (or the user turned up in any read) there is no reason to repeat it.
+_ENSURED: set[int] = set()
+
+async def ensure_user(user_id: int, conn=None) -> None:
+    """conn: pass an already-acquired connection to reuse it; defaults to
+    pool-level execution. Same convention on the other user helpers."""
+    if user_id in _ENSURED:
+        return
+    # Use $1 for parameter substitution in asyncpg, and ON CONFLICT DO NOTHING for INSERT OR IGNORE.
+    # Pool-level execute skips the explicit acquire/release dance and reuses the
+    # connection's cached prepared statement.
+    await (conn or db_pool).execute(
+        "INSERT INTO users (user_id, points) VALUES ($1, 0) ON CONFLICT (user_id) DO NOTHING",
+        user_id
+    )
+    _ENSURED.add(user_id)
+
+async def get_user_points(user_id: int, conn=None) -> int:
+    cached = _points_cache.get(user_id)
+    if cached and monotonic() - cached[0] < _POINTS_TTL:
+        return cached[1]
+    # Single lock coalesces a stampede of concurrent misses into one query.
+    async with _points_cache_lock:
+        cached = _points_cache.get(user_id)
+        if cached and monotonic() - cached[0] < _POINTS_TTL:
+            return cached[1]
+        # fetchval returns the scalar directly, or None when the row is missing
+        points = await (conn or db_pool).fetchval("SELECT points FROM users WHERE user_id=$1", user_id) or 0
+        _points_cache[user_id] = (monotonic(), points)
+        return points
+
+async def ensure_and_get_points(user_id: int, conn=None) -> int:
+    """Create the user row if missing and return current points in one round trip.
+
+    The no-op DO UPDATE is deliberate: ON CONFLICT DO NOTHING would skip the
+    RETURNING clause for existing rows.
+    """
+    points = await (conn or db_pool).fetchval(
+        "INSERT INTO users (user_id, points) VALUES ($1, 0) "
+        "ON CONFLICT (user_id) DO UPDATE SET points = users.points RETURNING points",
+        user_id
+    )
+    _points_cache[user_id] = (monotonic(), points)
+    _ENSURED.add(user_id)
+    return points
+
+async def award_points_bulk(pairs: List[tuple]) -> None:
+    """Award points to many users at once.
+
+    pairs is a list of (user_id, delta) tuples. executemany pipelines the
+    UPDATEs over one connection/transaction instead of one round trip per
+    user — use this from any bulk-approval flow.
+    """
+    if not pairs:
+        return
     async with db_pool.acquire() as conn:
-        # fetchrow returns a dict-like Row object or None
-        row = await conn.fetchrow("SELECT points FROM users WHERE user_id=$1", user_id)
-        return row['points'] if row else 0
+        async with conn.transaction():
+            await conn.executemany(
+                "UPDATE users SET points = points + $2 WHERE user_id = $1", pairs
+            )
+    for user_id, _ in pairs:
+        invalidate_points(user_id)
+
+async def fetch_points_bulk(user_ids: List[int]) -> dict:
+    """Fetch points for many users in one query instead of per-user SELECTs."""
+    rows = await db_pool.fetch(
+        "SELECT user_id, points FROM users WHERE user_id = ANY($1::bigint[])", user_ids
+    )
+    return {r['user_id']: r['points'] for r in rows}
 
 async def is_banned(user_id: int) -> bool:
-    async with db_pool.acquire() as conn:
-        row = await conn.fetchrow("SELECT 1 FROM banned_users WHERE user_id=$1", user_id)
-        return row is not None
+    return user_id in BANNED
+
+# All 13 possible width-12 bars, built once at import — the default case
+# becomes a list index instead of two string multiplies per embed line.
+_BAR_W12 = ["█" * i + " " * (12 - i) for i in range(13)]
 
+@lru_cache(maxsize=256)
 def calc_progress_bar(done: int, limit: int, width: int = 12) -> str:
     if limit <= 0:
         return " " * width
     filled = int(round((done / limit) * width))
     filled = max(0, min(filled, width))
+    if width == 12:
+        return _BAR_W12[filled]
     return "█" * filled + " " * (width - filled)
 
-async def task_title_by_id(task_id: int) -> Optional[str]:
-    async with db_pool.acquire() as conn:
-        row = await conn.fetchrow("SELECT title FROM tasks WHERE id=$1", task_id)
-        return row['title'] if row else None
+# Tasks are near-static (edited rarely, read on every render), so keep them in
+# memory. Loaded once at startup; admin create/edit/archive/remove handlers
+# mutate the dict right after their SQL write.
+TASKS: dict[int, dict] = {}
+
+_TASK_COLUMNS = (
+    "id, title, points, max_submissions, archived, role_reward_id, "
+    "daily_flag, type, task_link, announcement_message_id"
+)
+
+async def load_tasks() -> None:
+    rows = await db_pool.fetch(f"SELECT {_TASK_COLUMNS} FROM tasks")
+    TASKS.clear()
+    TASKS.update({r['id']: dict(r) for r in rows})
+
+async def _reload_task(task_id: int) -> None:
+    row = await db_pool.fetchrow(f"SELECT {_TASK_COLUMNS} FROM tasks WHERE id=$1", task_id)
+    if row:
+        TASKS[task_id] = dict(row)
+    else:
+        TASKS.pop(task_id, None)
+
+def _on_cache_invalidate(conn, pid, channel, payload):
+    """Handle a NOTIFY from the cache_invalidate triggers.
 
-def next_milestones_reached(old_pts: int, new_pts: int, milestones: List[int]) -> List[int]:
-    return [m for m in milestones if old_pts < m <= new_pts]
+    Payloads look like 'points:123'. The triggers fire for this process's
+    own writes too, but those paths already update the local caches (often
+    priming rather than evicting), so echoes from our own backends are
+    dropped instead of undoing that work one tick later.
+    """
+    if pid in _POOL_PIDS:
+        return
+    kind, _, ident = payload.partition(':')
+    try:
+        ident = int(ident)
+    except ValueError:
+        return
+    if kind == 'points':
+        invalidate_points(ident)
+    elif kind == 'ban':
+        BANNED.add(ident)
+    elif kind == 'unban':
+        BANNED.discard(ident)
+    elif kind == 'task':
+        # Listener callbacks are synchronous; re-read the row off-callback.
+        asyncio.create_task(_reload_task(ident))
+
+# Titles for ids absent from TASKS (e.g. deleted tasks still referenced by
+# old submissions) would otherwise cost a SELECT per notification; remember
+# those lookups for a few minutes too.
+_title_fallbacks = TTLCache(maxsize=512, ttl=300)
 
+async def task_title_by_id(task_id: int) -> Optional[str]:
+    task = TASKS.get(task_id)
+    if task:
+        return task['title']
+    if task_id in _title_fallbacks:
+        return _title_fallbacks[task_id]
+    # Cache miss (e.g. task created before the cache loaded) — fall back to the DB.
+    title = await db_pool.fetchval("SELECT title FROM tasks WHERE id=$1", task_id)
+    _title_fallbacks[task_id] = title
+    return title
+
+# Sorted once at import so milestone checks can binary-search instead of
+# scanning the whole list on every points update. A tuple keeps the default
+# hashable for the lru_cache below.
+_MS = tuple(sorted(MILESTONES))
+
+@lru_cache(maxsize=1024)
+def next_milestones_reached(old_pts: int, new_pts: int, milestones: tuple = _MS) -> tuple:
+    lo = bisect.bisect_right(milestones, old_pts)
+    hi = bisect.bisect_right(milestones, new_pts)
+    return milestones[lo:hi]
+
+# Rank tiers as parallel threshold/label tables; adding a tier only means
+# extending these two tuples.
+_RANK_THRESHOLDS = (500, 1000, 1500, 2000)
+_RANK_LABELS = ("🎈 Newbie", "🚀 Explorer", "🌟 Adventurer", "🔥 Pro", "👑 Master")
+
+@lru_cache(maxsize=64)
 def get_rank(points: int) -> str:
-    if points >= 2000: return "👑 Master"
-    if points >= 1500: return "🔥 Pro"
-    if points >= 1000: return "🌟 Adventurer"
-    if points >= 500: return "🚀 Explorer"
-    return "🎈 Newbie"
+    return _RANK_LABELS[bisect.bisect_right(_RANK_THRESHOLDS, points)]
 
 # =========================
-# EVENTS
+# STARTUP / EVENTS
 # =========================
+_init_lock = asyncio.Lock()
+_inited = False
+
+async def init_once():
+    """Initialize the DB pool, caches and background loops exactly once.
+
+    The lock makes this safe against racing on_ready dispatches on fast
+    reconnects — a hasattr check alone could let two coroutines both create
+    a pool and leak connections.
+    """
+    global _inited
+    async with _init_lock:
+        if _inited:
+            return
+        await init_db()
+        if db_pool is None:
+            return
+        await load_tasks()
+        await load_banned()
+        # Dedicated connection that listens for cross-instance cache
+        # invalidation; held for the process lifetime.
+        listener_conn = await db_pool.acquire()
+        await listener_conn.add_listener('cache_invalidate', _on_cache_invalidate)
+        # Re-register task buttons as persistent so boards sent before a
+        # restart keep responding; labels are irrelevant for dispatch.
+        active = [t for t in TASKS.values() if not t['archived']][:25]
+        if active:
+            persistent = View(timeout=None)
+            for task in active:
+                persistent.add_item(TaskButton(task))
+            bot.add_view(persistent)
+        bot.add_view(_ADMIN_VIEW)
+        asyncio.create_task(refresh_leaderboard_loop())
+        asyncio.create_task(pool_stats_loop())
+        asyncio.create_task(slots_announce_loop())
+        _inited = True
+
 @bot.event
 async def on_ready():
-    # Bug Fix: Ensure on_ready doesn't run multiple times on reconnects
+    # Startup normally happens in main() before login; this is a cheap safety
+    # net that the lock inside init_once makes race-free.
+    await init_once()
+    # Resolve the fixed channels once per connect; get_channel walks the
+    # channel map on every call and these ids never change at runtime.
+    bot._notif_channel = bot.get_channel(NOTIFICATION_CHANNEL_ID)
+    bot._announce_channel = bot.get_channel(ANNOUNCEMENT_CHANNEL_ID)
+    bot._withdrawal_channel = bot.get_channel(WITHDRAWAL_CHANNEL_ID)
+    bot._slots_channel = bot.get_channel(SLOTS_CHANNEL_ID)
     if not hasattr(bot, 'ready_ran'):
         bot.ready_ran = True
         banner = """
@@ -191,29 +533,31 @@ async def on_ready():
           🚀 Quest Bot is ONLINE! 🚀
         ============================
         """
-        print(banner)
-        # Initialize the database connection pool
-        await init_db() 
-        print(f"✅ Logged in as {bot.user} (id={bot.user.id})")
-    print(f"Bot reconnected or ready. Current status: {bot.user}")
+        log.info(banner)
+        log.info("✅ Logged in as %s (id=%s)", bot.user, bot.user.id)
+    log.info("Bot reconnected or ready. Current status: %s", bot.user)
 
 # =========================
 # COMMANDS
 # =========================
 
+# The help text never changes at runtime, so build the embed once at import
+# instead of re-formatting it on every invocation.
+_HELP_EMBED = discord.Embed(title="Quest Bot — Commands", color=0x00E5A8)
+_HELP_EMBED.description = (
+    f"**Players**\n"
+    f"• `{PREFIX}tasks` – list active tasks\n"
+    f"• `{PREFIX}submit` – submit to a task\n"
+    f"• `{PREFIX}profile [@user]` – show profile & task history\n"
+    f"• `{PREFIX}leaderboard` – top 10 users\n\n"
+    f"**Admins**\n"
+    f"• `{PREFIX}admindashboard` – the new admin hub\n"
+)
+
+
 @bot.command(name="help")
 async def help_cmd(ctx: commands.Context):
-    embed = discord.Embed(title="Quest Bot — Commands", color=0x00E5A8)
-    embed.description = (
-        f"**Players**\n"
-        f"• `{PREFIX}tasks` – list active tasks\n"
-        f"• `{PREFIX}submit` – submit to a task\n"
-        f"• `{PREFIX}profile [@user]` – show profile & task history\n"
-        f"• `{PREFIX}leaderboard` – top 10 users\n\n"
-        f"**Admins**\n"
-        f"• `{PREFIX}admindashboard` – the new admin hub\n"
-    )
-    await ctx.send(embed=embed)
+    await ctx.send(embed=_HELP_EMBED)
 
 # ---- Admin: Add Task ----
 @bot.command()
@@ -230,11 +574,18 @@ async def addtask(ctx, title: str, points: int, max_subs: int, ttype: str = "lin
             title, points, max_subs, role.id if role else None, ttype
         )
         tid = row['id'] if row else None
-    
+
     if not tid:
         await ctx.send("❌ Failed to add task to database.")
         return
 
+    TASKS[tid] = {
+        'id': tid, 'title': title, 'points': points, 'max_submissions': max_subs,
+        'archived': 0, 'role_reward_id': role.id if role else None, 'daily_flag': 0,
+        'type': ttype, 'task_link': None, 'announcement_message_id': None,
+    }
+    bump_board_version()
+
     await ctx.send(f"✅ Task added (ID {tid}): **{title}** — {points} pts, max {max_subs}, type {ttype}\nPlease reply with the **link** for this task.")
 
     def check(msg): return msg.author == ctx.author and msg.channel == ctx.channel
@@ -244,19 +595,22 @@ async def addtask(ctx, title: str, points: int, max_subs: int, ttype: str = "lin
 
         async with db_pool.acquire() as conn:
             await conn.execute("UPDATE tasks SET task_link=$1 WHERE id=$2", link, tid)
-        
+        TASKS[tid]['task_link'] = link
+        bump_board_version()
+
         await ctx.send(f"🔗 Task link saved for **{title}**: {link}")
 
-        announce_channel = bot.get_channel(ANNOUNCEMENT_CHANNEL_ID)
+        announce_channel = getattr(bot, "_announce_channel", None)
         if announce_channel:
             try:
                 announcement_msg = await announce_channel.send(f"@everyone, a new task has just dropped! ({title} | {points} points)\n(Type `!tasks` to view the task and submit proof)")
                 
                 async with db_pool.acquire() as conn:
                     await conn.execute("UPDATE tasks SET announcement_message_id=$1 WHERE id=$2", announcement_msg.id, tid)
+                TASKS[tid]['announcement_message_id'] = announcement_msg.id
 
             except Exception as e:
-                print(f"Error sending announcement to channel {ANNOUNCEMENT_CHANNEL_ID}: {e}")
+                log.exception("Error sending announcement to channel %s: %s", ANNOUNCEMENT_CHANNEL_ID, e)
 
     except asyncio.TimeoutError:
         await ctx.send("⌛ Timed out waiting for a link. You can set it manually later.")
@@ -265,9 +619,31 @@ async def addtask(ctx, title: str, points: int, max_subs: int, ttype: str = "lin
 # ------------------------
 # Task Button callback factory (top-level, reusable)
 # ------------------------
-last_click = {}
 BUTTON_COOLDOWN = 10  # seconds
 
+# One source of truth for the per-type button emoji.
+_TYPE_EMOJIS = {"like": "👍", "rt": "🔁", "link": "🔗"}
+
+_OK_SCHEMES = {"http", "https"}
+
+
+def _is_valid_link(text: str) -> bool:
+    """True for an actual http(s) URL, not just anything starting with 'http'."""
+    try:
+        parsed = urlparse(text)
+    except ValueError:
+        return False
+    return parsed.scheme in _OK_SCHEMES and bool(parsed.netloc)
+
+# Click timestamps keyed by (user_id, task_id). Entries only matter for the
+# cooldown window, so a TTL cache evicts them shortly after instead of
+# growing O(users x tasks) forever like a plain dict would.
+last_click = TTLCache(maxsize=50_000, ttl=BUTTON_COOLDOWN + 5)
+
+# Dedicated RNG instance: skips the module-level wrapper indirection and keeps
+# our state separate from anything else using the global random module.
+RNG = random.Random()
+
 COOLDOWN_MESSAGES = [
     "⏳ Quest cooldown! Take a sip of water 💧",
     "😅 Whoa {user}, calm down — adventurers need rest too 🛑",
@@ -277,151 +653,258 @@ COOLDOWN_MESSAGES = [
     "🐢 Slow and steady wins the quest {user}!"
 ]
 
-def make_task_callback_factory(board_msg: discord.Message, ctx_author: discord.Member):
-    """
-    Returns an async callback for a task button.
-    board_msg: the message object of the tasks board (so we can refresh it later)
-    ctx_author: the member who invoked the original !tasks command (keeps the original behavior)
-    """
-    async def factory(tid: int, title: str, ttype: str, link: Optional[str],
-                      max_subs: int, pts: int, emoji: str, star: str):
-        async def task_cb(interaction: discord.Interaction):
-            if interaction.user != ctx_author:
-                await interaction.response.send_message(
-                    "⛔ Only the command caller can use this button.",
-                    ephemeral=True
+# Slot announcements are fire-and-forget: submissions enqueue their progress
+# and a single drain task sends the messages off the critical path. The drain
+# waits a beat and keeps only the latest count per task, so a burst of
+# submissions yields one announcement per task instead of one per click.
+SLOTS_ANNOUNCE_DELAY = 2.0  # seconds
+_slots_queue: asyncio.Queue = asyncio.Queue()
+
+
+async def slots_announce_loop():
+    while True:
+        tid, title, slots_left = await _slots_queue.get()
+        pending = {tid: (title, slots_left)}
+        await asyncio.sleep(SLOTS_ANNOUNCE_DELAY)
+        while not _slots_queue.empty():
+            tid, title, slots_left = _slots_queue.get_nowait()
+            pending[tid] = (title, slots_left)
+
+        slots_channel = getattr(bot, "_slots_channel", None)
+        if not slots_channel:
+            continue
+        for title, slots_left in pending.values():
+            try:
+                slots_embed = discord.Embed(
+                    title="📢 Quest Progress Update",
+                    description=f"**{title}** has {slots_left} slots left!",
+                    color=0x32CD32
                 )
-                return
-            
-            # Check if user is banned
-            if await is_banned(interaction.user.id):
-                await interaction.response.send_message("⛔ You are banned from submitting quests.", ephemeral=True)
-                return
+                slots_embed.set_footer(text=f"A new submission was received. {slots_left} slots remaining!")
+                await slots_channel.send(embed=slots_embed)
+            except Exception as e:
+                log.exception("Error sending slot announcement to channel %s: %s", SLOTS_CHANNEL_ID, e)
 
-            now = datetime.datetime.utcnow()
-            key = (interaction.user.id, tid)
-            last = last_click.get(key)
-            if last and (now - last).total_seconds() < BUTTON_COOLDOWN:
-                remaining = BUTTON_COOLDOWN - (now - last).total_seconds()
-                msg = random.choice(COOLDOWN_MESSAGES).format(
-                    user=interaction.user.mention,
-                    title=title,
-                    sec=int(remaining)
-                )
-                await interaction.response.send_message(msg, ephemeral=True)
-                return
-            last_click[key] = now
-            
-            # Get the current count of submissions for this task
-            async with db_pool.acquire() as conn:
-                done_row = await conn.fetchrow(
-                    "SELECT COUNT(*) AS cnt FROM submissions WHERE task_id=$1 AND status!='rejected'",
-                    tid
-                )
-                done_count = done_row['cnt'] if done_row else 0
-
-                if done_count >= max_subs:
-                    await interaction.response.send_message(
-                        f"🚫 Quest **{title}** is full and now closed.",
-                        ephemeral=True
-                    )
-                    await conn.execute("UPDATE tasks SET archived=1 WHERE id=$1", tid)
-                    await refresh_task_board(board_msg)
-                    return
-                
-                # Check if the user has already submitted
-                existing = await conn.fetchrow(
-                    "SELECT id, status FROM submissions WHERE user_id=$1 AND task_id=$2",
-                    interaction.user.id, tid
-                )
-            
-            if existing:
-                await interaction.response.send_message(
-                    f"⚠️ You already submitted for **{title}**.\n"
-                    f"📝 Status: `{existing['status']}`",
-                    ephemeral=True
-                )
-                return
-            
+async def handle_task_submission(interaction: discord.Interaction, task: dict, owner_id: Optional[int] = None):
+    """Shared click handler for every task button.
+
+    Task metadata comes from the TASKS cache via the button's custom_id, so
+    rebuilding a board allocates no closures. The clicked message *is* the
+    board, which is what gets refreshed afterwards.
+    """
+    tid = task['id']
+    title = task['title']
+    ttype = task['type']
+    link = task['task_link']
+    max_subs = task['max_submissions']
+    pts = task['points']
+    emoji = _TYPE_EMOJIS.get(ttype, "🎯")
+    board_msg = interaction.message
+
+    if owner_id is not None and interaction.user.id != owner_id:
+        await interaction.response.send_message(
+            "⛔ Only the command caller can use this button.",
+            ephemeral=True
+        )
+        return
+
+    # Check if user is banned
+    if await is_banned(interaction.user.id):
+        await interaction.response.send_message("⛔ You are banned from submitting quests.", ephemeral=True)
+        return
 
-            intro = discord.Embed(
-                title=f"{emoji} Quest: {title}",
-                description=f"Type: `{ttype.upper()}`\nReward: **{pts} pts**\n\n"
-                            f"Follow the instructions and submit your **link** proof!",
-                color=0x32CD32
+    # Monotonic loop time: a plain float compare, immune to wall-clock jumps,
+    # and no datetime object allocated per click.
+    now = asyncio.get_running_loop().time()
+    key = (interaction.user.id, tid)
+    last = last_click.get(key)
+    if last is not None and now - last < BUTTON_COOLDOWN:
+        remaining = BUTTON_COOLDOWN - (now - last)
+        msg = RNG.choice(COOLDOWN_MESSAGES).format(
+            user=interaction.user.mention,
+            title=title,
+            sec=int(remaining)
+        )
+        await interaction.response.send_message(msg, ephemeral=True)
+        return
+    last_click[key] = now
+
+    # Get the current count of submissions for this task
+    async with db_pool.acquire() as conn:
+        done_count = await conn.fetchval(
+            "SELECT COUNT(*) FROM submissions WHERE task_id=$1 AND status!='rejected'",
+            tid
+        ) or 0
+
+        if done_count >= max_subs:
+            # Archive while we hold the connection; everything else about
+            # the full branch — Discord round trips and the debounced board
+            # refresh — waits until the connection is back in the pool.
+            await conn.execute("UPDATE tasks SET archived=1 WHERE id=$1", tid)
+            existing = None
+        else:
+            # Check if the user has already submitted
+            existing = await conn.fetchrow(
+                "SELECT id, status FROM submissions WHERE user_id=$1 AND task_id=$2",
+                interaction.user.id, tid
             )
-            task_view = View()
-            if link and link.startswith(("http://", "https://")):
-                task_link_button = Button(label="Click Here", style=discord.ButtonStyle.link, url=link)
-                task_view.add_item(task_link_button)
 
-            await interaction.response.send_message(embed=intro, view=task_view, ephemeral=True)
+    if done_count >= max_subs:
+        if tid in TASKS:
+            TASKS[tid]['archived'] = 1
+        bump_board_version()
+        await interaction.response.send_message(
+            f"🚫 Quest **{title}** is full and now closed.",
+            ephemeral=True
+        )
+        await refresh_task_board(board_msg)
+        return
 
-            proof = None
-            try:
-                # IMPORTANT: Since cloud hosting uses ephemeral storage, we **ONLY** accept link proof.
-                prompt = await interaction.followup.send(f"🔗 {interaction.user.mention}, paste your proof link for **{title}** (3 min timeout).", ephemeral=True)
-                
-                # Check for any message containing a link
-                def check_link(msg): return msg.author.id == interaction.user.id and msg.content.startswith("http") and msg.channel == interaction.channel
-                try:
-                    msg = await bot.wait_for("message", check=check_link, timeout=180)
-                    proof = msg.content.strip()
-                    await msg.delete()
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("⌛ Time’s up! Submission cancelled.", ephemeral=True)
-                    return
-            except Exception as e:
-                try:
-                    await interaction.followup.send("❌ An error occurred while collecting proof. Try again.", ephemeral=True)
-                except:
-                    pass
-                print("[collect proof error]", e)
-                return
+    if existing:
+        await interaction.response.send_message(
+            f"⚠️ You already submitted for **{title}**.\n"
+            f"📝 Status: `{existing['status']}`",
+            ephemeral=True
+        )
+        return
 
-            await ensure_user(interaction.user.id)
-            async with db_pool.acquire() as conn:
-                await conn.execute(
-                    "INSERT INTO submissions (user_id, task_id, proof) VALUES ($1, $2, $3)",
-                    interaction.user.id, tid, proof
-                )
-            
-            slots_channel = bot.get_channel(SLOTS_CHANNEL_ID)
-            if slots_channel:
-                try:
-                    new_done_count = done_count + 1
-                    slots_left = max_subs - new_done_count
-                    slots_embed = discord.Embed(
-                        title="📢 Quest Progress Update",
-                        description=f"**{title}** has {slots_left} slots left!",
-                        color=0x32CD32
-                    )
-                    slots_embed.set_footer(text=f"A new submission was received. {slots_left} slots remaining!")
-                    await slots_channel.send(embed=slots_embed)
-                except Exception as e:
-                    print(f"Error sending slot announcement to channel {SLOTS_CHANNEL_ID}: {e}")
 
-            success = discord.Embed(
-                title="📥 Submission Sent!",
-                description=f"✨ **{title}**\nYour proof is pending admin review.\n\n"
-                            f"✅ Once approved, you’ll earn your points!",
-                color=0xFFD700
-            )
-            success.set_footer(text="Keep grinding quests 💪")
-            await interaction.followup.send(embed=success, ephemeral=True)
+    intro = discord.Embed(
+        title=f"{emoji} Quest: {title}",
+        description=f"Type: `{ttype.upper()}`\nReward: **{pts} pts**\n\n"
+                    f"Follow the instructions and submit your **link** proof!",
+        color=0x32CD32
+    )
+    task_view = View()
+    if link and _is_valid_link(link):
+        task_link_button = Button(label="Click Here", style=discord.ButtonStyle.link, url=link)
+        task_view.add_item(task_link_button)
 
-            await refresh_task_board(board_msg)
+    await interaction.response.send_message(embed=intro, view=task_view, ephemeral=True)
 
-        return task_cb
-    return factory
+    proof = None
+    try:
+        # IMPORTANT: Since cloud hosting uses ephemeral storage, we **ONLY** accept link proof.
+        prompt = await interaction.followup.send(f"🔗 {interaction.user.mention}, paste your proof link for **{title}** (3 min timeout).", ephemeral=True)
+
+        # Check for any message containing a link
+        def check_link(msg): return msg.author.id == interaction.user.id and msg.channel == interaction.channel and _is_valid_link(msg.content.strip())
+        try:
+            msg = await bot.wait_for("message", check=check_link, timeout=180)
+            # Keep within the proof length CHECK on submissions
+            proof = msg.content.strip()[:2000]
+            # Fire-and-forget: the submitter shouldn't wait on the delete round trip.
+            asyncio.create_task(msg.delete())
+        except asyncio.TimeoutError:
+            await interaction.followup.send("⌛ Time’s up! Submission cancelled.", ephemeral=True)
+            return
+    except Exception as e:
+        try:
+            await interaction.followup.send("❌ An error occurred while collecting proof. Try again.", ephemeral=True)
+        except:
+            pass
+        log.exception("collect proof error: %s", e)
+        return
+
+    await ensure_user(interaction.user.id)
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            "INSERT INTO submissions (user_id, task_id, proof) VALUES ($1, $2, $3)",
+            interaction.user.id, tid, proof
+        )
+    bump_board_version()
+    invalidate_review_embed()
+
+    # Hand the announcement to the drain task; the submitter doesn't wait on it.
+    _slots_queue.put_nowait((tid, title, max_subs - (done_count + 1)))
+
+    success = discord.Embed(
+        title="📥 Submission Sent!",
+        description=f"✨ **{title}**\nYour proof is pending admin review.\n\n"
+                    f"✅ Once approved, you’ll earn your points!",
+        color=0xFFD700
+    )
+    success.set_footer(text="Keep grinding quests 💪")
+    await interaction.followup.send(embed=success, ephemeral=True)
+
+    await refresh_task_board(board_msg)
+
+
+def _task_button_label(task: dict, done: int) -> str:
+    star = " ⭐" if task['daily_flag'] else ""
+    emoji = _TYPE_EMOJIS.get(task['type'], "🎯")
+    return f"{emoji} {task['title']} ({task['points']} pts){star} [{done}/{task['max_submissions']}]"
+
+
+class TaskButton(Button):
+    """Task-board button with the task id on its custom_id.
+
+    All buttons share one callback that resolves the task from the TASKS
+    cache, instead of each carrying its own factory-built closure; the stable
+    custom_id is also what lets views be registered as persistent.
+    """
+
+    def __init__(self, task: dict, done: int = 0, owner_id: Optional[int] = None):
+        super().__init__(label=_task_button_label(task, done),
+                         style=discord.ButtonStyle.primary, custom_id=f"task:{task['id']}")
+        self.owner_id = owner_id
+
+    async def callback(self, interaction: discord.Interaction):
+        tid = int(self.custom_id.split(":", 1)[1])
+        task = TASKS.get(tid)
+        if not task or task['archived']:
+            await interaction.response.send_message("🚫 This quest is no longer available.", ephemeral=True)
+            return
+        await handle_task_submission(interaction, task, self.owner_id)
+
+# Monotonic version of the task-board's source data. Any write to tasks or
+# submissions bumps it; a board whose rendered version still matches skips the
+# whole re-query/re-render cycle.
+_board_version = 0
+# Both registries are keyed by board message id and entries are only useful
+# while someone is still clicking that board, so TTL caches keep them from
+# growing by one View per !tasks forever (same reasoning as last_click);
+# refresh_task_board rebuilds from scratch when an evicted board resurfaces.
+_board_rendered = TTLCache(maxsize=1000, ttl=3600)   # message id -> version rendered
+_board_views = TTLCache(maxsize=1000, ttl=3600)      # message id -> live View, patched in place
+_pending_refreshes: set[int] = set()
+BOARD_REFRESH_DEBOUNCE = 1.0  # seconds — coalesces submission bursts
+
+def bump_board_version() -> None:
+    global _board_version
+    _board_version += 1
+
+# Task list and submission counts in one statement. The lateral count runs
+# per surviving task row, and the done < max_submissions predicate hides full
+# tasks right in SQL — no Python-side full check and no racy runtime
+# UPDATE tasks SET archived=1 (a full task simply never renders; the click
+# path still archives on submission).
+_OPEN_TASKS_SQL = """
+    SELECT t.id, t.title, t.points, t.max_submissions, t.type, t.daily_flag, t.task_link, d.done
+    FROM tasks t
+    LEFT JOIN LATERAL (
+        SELECT COUNT(*) AS done FROM submissions s
+        WHERE s.task_id = t.id AND s.status != 'rejected'
+    ) d ON TRUE
+    WHERE t.archived = 0 AND d.done < t.max_submissions
+    ORDER BY t.id
+    LIMIT 10
+"""
+
+
+def _build_board_view(rows, owner_id: Optional[int]) -> View:
+    """One renderer for both board entry points: rows from _OPEN_TASKS_SQL in,
+    persistent View of TaskButtons out."""
+    view = View(timeout=None)
+    for r in rows:
+        task = TASKS.get(r['id']) or dict(r)
+        view.add_item(TaskButton(task, r['done'], owner_id=owner_id))
+    return view
 
 # ---- Public: Tasks ----
 @bot.command(name="tasks")
 async def tasks_cmd(ctx: commands.Context):
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT id, title, points, max_submissions, type, daily_flag, task_link FROM tasks WHERE archived=0"
-        )
+    rows = await db_pool.fetch(_OPEN_TASKS_SQL)
 
     if not rows:
         await ctx.send("⚠️ No active quests right now.")
@@ -437,79 +920,58 @@ async def tasks_cmd(ctx: commands.Context):
 
     # Send a temporary message to get a message object for refreshing
     board_msg = await ctx.send(embed=embed, view=view)
-    factory = make_task_callback_factory(board_msg, ctx.author)
-    
-    # We need a new view to attach callbacks to
-    new_view = View() 
-    
-    type_emojis = {"like": "👍", "rt": "🔁", "link": "🔗"}
 
-    for r in rows[:10]:
-        tid, title, pts, max_subs, ttype, daily, link = r['id'], r['title'], r['points'], r['max_submissions'], r['type'], r['daily_flag'], r['task_link']
-        
-        # Calculate the number of "done" submissions
-        async with db_pool.acquire() as conn:
-            done_row = await conn.fetchrow(
-                "SELECT COUNT(*) AS cnt FROM submissions WHERE task_id=$1 AND status!='rejected'",
-                tid
-            )
-            done = done_row['cnt'] if done_row else 0
-        
-            if done >= max_subs:
-                await conn.execute("UPDATE tasks SET archived=1 WHERE id=$1", tid)
-                continue
-
-        star = " ⭐" if daily else ""
-        emoji = type_emojis.get(ttype, "🎯")
-        button_label = f"{emoji} {title} ({pts} pts){star} [{done}/{max_subs}]"
-
-        cb = await factory(tid, title, ttype, link, max_subs, pts, emoji, star)
-        btn = Button(label=button_label, style=discord.ButtonStyle.primary)
-        btn.callback = cb
-        new_view.add_item(btn)
+    # Persistent view: TaskButton resolves its task via custom_id on click
+    new_view = _build_board_view(rows, ctx.author.id)
 
     await board_msg.edit(embed=embed, view=new_view)
+    _board_views[board_msg.id] = new_view
+    _board_rendered[board_msg.id] = _board_version
 
 async def refresh_task_board(message: discord.Message):
-    """Rebuild the board view after submission so counters update immediately."""
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT id, title, points, max_submissions, type, daily_flag, task_link FROM tasks WHERE archived=0"
-        )
-    
-    view = View()
-    type_emojis = {"like": "👍", "rt": "🔁", "link": "🔗"}
+    """Refresh the board view after submission so counters update immediately.
 
-    ctx_author = message.interaction.user if message.interaction else (message.guild.owner if message.guild else None)
-
-    if not ctx_author:
-        # Cannot proceed without a valid context author to bind the factory
+    Debounced and versioned: near-simultaneous submissions coalesce into a
+    single refresh, and the refresh is skipped entirely when nothing has
+    changed since this message was last rendered. When the live View is still
+    around, its button labels are patched in place instead of reallocating
+    the whole tree of Buttons.
+    """
+    if message.id in _pending_refreshes:
         return
-
-    factory = make_task_callback_factory(message, ctx_author)
-
-    for r in rows[:10]:
-        tid, title, pts, max_subs, ttype, daily, link = r['id'], r['title'], r['points'], r['max_submissions'], r['type'], r['daily_flag'], r['task_link']
-        
-        async with db_pool.acquire() as conn:
-            done_row = await conn.fetchrow(
-                "SELECT COUNT(*) AS cnt FROM submissions WHERE task_id=$1 AND status!='rejected'",
-                tid
-            )
-            done = done_row['cnt'] if done_row else 0
-        
-            if done >= max_subs:
-                async with db_pool.acquire() as conn:
-                    await conn.execute("UPDATE tasks SET archived=1 WHERE id=$1", tid)
-                continue
-            
-        star = " ⭐" if daily else ""
-        emoji = type_emojis.get(ttype, "🎯")
-        btn_label = f"{emoji} {title} ({pts} pts){star} [{done}/{max_subs}]"
-        cb = await factory(tid, title, ttype, link, max_subs, pts, emoji, star)
-        btn = Button(label=btn_label, style=discord.ButtonStyle.primary)
-        btn.callback = cb
-        view.add_item(btn)
+    if _board_rendered.get(message.id) == _board_version:
+        return
+    _pending_refreshes.add(message.id)
+    try:
+        await asyncio.sleep(BOARD_REFRESH_DEBOUNCE)
+    finally:
+        _pending_refreshes.discard(message.id)
+    version = _board_version
+
+    rows = await db_pool.fetch(_OPEN_TASKS_SQL)
+    by_id = {r['id']: r for r in rows}
+
+    view = _board_views.get(message.id)
+    if view is not None:
+        # Patch the existing buttons: update counters, drop tasks that are now
+        # full or archived, append any task added since the board was sent.
+        for btn in list(view.children):
+            tid = int(btn.custom_id.split(":", 1)[1])
+            r = by_id.pop(tid, None)
+            if r is None:
+                view.remove_item(btn)
+            else:
+                btn.label = _task_button_label(TASKS.get(tid) or dict(r), r['done'])
+        owner_id = next((b.owner_id for b in view.children if isinstance(b, TaskButton)), None)
+        for r in by_id.values():
+            view.add_item(TaskButton(TASKS.get(r['id']) or dict(r), r['done'], owner_id=owner_id))
+    else:
+        # No live View (e.g. after a restart) — build one from scratch,
+        # restricted to the original invoker when we can still tell who
+        # that was.
+        ctx_author = message.interaction.user if message.interaction else None
+        view = _build_board_view(rows, ctx_author.id if ctx_author else None)
+        _board_views[message.id] = view
 
     try:
         # Check if view is empty before editing, to prevent discord.HTTPException: Must be an interaction or an original response to a non-interaction
@@ -517,9 +979,11 @@ async def refresh_task_board(message: discord.Message):
             await message.edit(view=view)
         else:
             await message.edit(embed=message.embeds[0], view=None, content="⚠️ No active quests right now.")
-            
+            _board_views.pop(message.id, None)
+        _board_rendered[message.id] = version
+
     except Exception as e:
-        print(f"[refresh_task_board error] {e}")
+        log.exception("refresh_task_board error: %s", e)
 
 # ---- Public: Profile with Next Page (UPDATED FOR GAMIFIED HISTORY) ----
 class TaskHistoryView(discord.ui.View):
@@ -606,26 +1070,150 @@ class TaskHistoryView(discord.ui.View):
         new_embed = await self.build_history_embed()
         await interaction.response.edit_message(embed=new_embed, view=self)
 
+async def _announce_withdrawal(user_id: int, points_to_withdraw: int, withdrawal_id: int):
+    """Post the admin review card for a new withdrawal request."""
+    announce_channel = getattr(bot, "_withdrawal_channel", None)
+    if not announce_channel:
+        return
+    try:
+        embed = discord.Embed(
+            title="💰 New Withdrawal Request",
+            description=f"A new withdrawal request has been submitted by <@{user_id}>.",
+            color=0xFFD700
+        )
+        embed.add_field(name="Points", value=str(points_to_withdraw), inline=True)
+        embed.add_field(name="Status", value="Pending", inline=True)
+        embed.set_footer(text=f"Request ID: {withdrawal_id}")
+
+        admin_view = View()
+        view_details_btn = Button(label="View Details", style=discord.ButtonStyle.primary)
+        approve_btn = Button(label="✅ Approve", style=discord.ButtonStyle.success)
+
+        async def view_details_cb(admin_inter: discord.Interaction):
+            if not admin_inter.user.guild_permissions.administrator:
+                await admin_inter.response.send_message("⛔ You must be an administrator to view this.", ephemeral=True)
+                return
+
+            async with db_pool.acquire() as conn:
+                row = await conn.fetchrow("SELECT * FROM withdrawals WHERE id=$1", withdrawal_id)
+
+            if not row:
+                await admin_inter.response.send_message("⚠️ Withdrawal request not found.", ephemeral=True)
+                return
+
+            details_embed = discord.Embed(title=f"Withdrawal Request #{withdrawal_id} Details", color=0x00B8FF)
+            details_embed.add_field(name="User", value=f"<@{row['user_id']}>", inline=False)
+            details_embed.add_field(name="Points", value=str(row['points']), inline=False)
+            details_embed.add_field(name="Bank Name", value=row['bank_name'], inline=False)
+            details_embed.add_field(name="Account Name", value=row['account_name'], inline=False)
+            details_embed.add_field(name="Account Number", value=row['account_number'], inline=False)
+            details_embed.add_field(name="Status", value=row['status'], inline=False)
+
+            await admin_inter.response.send_message(embed=details_embed, ephemeral=True)
+
+        async def approve_withdrawal_cb(admin_inter: discord.Interaction):
+            if not admin_inter.user.guild_permissions.administrator:
+                await admin_inter.response.send_message("⛔ You must be an administrator to approve this.", ephemeral=True)
+                return
+
+            async with db_pool.acquire() as conn:
+                await conn.execute("UPDATE withdrawals SET status='completed' WHERE id=$1", withdrawal_id)
+
+            approved_embed = discord.Embed(
+                title="✅ Withdrawal Approved",
+                description=f"Request **#{withdrawal_id}** for **{points_to_withdraw} points** has been approved.",
+                color=0x00CC66
+            )
+            approved_embed.set_footer(text=f"Approved by {admin_inter.user.display_name}")
+
+            admin_view.children[0].disabled = True
+            admin_view.children[1].disabled = True
+
+            await admin_inter.response.edit_message(embed=approved_embed, view=admin_view)
+
+        view_details_btn.callback = view_details_cb
+        approve_btn.callback = approve_withdrawal_cb
+
+        admin_view.add_item(view_details_btn)
+        admin_view.add_item(approve_btn)
+
+        await announce_channel.send(embed=embed, view=admin_view)
+    except Exception as e:
+        log.exception("Error sending withdrawal notification to channel %s: %s", WITHDRAWAL_CHANNEL_ID, e)
+
+
+class WithdrawalModal(discord.ui.Modal, title="Withdraw Points"):
+    """All four withdrawal fields in one submit instead of four sequential
+    wait_for round trips (and four delayed message deletions)."""
+    bank_name_input = discord.ui.TextInput(label="Bank Name", min_length=2)
+    account_number_input = discord.ui.TextInput(label="Account Number", min_length=5)
+    account_name_input = discord.ui.TextInput(label="Account Name", min_length=2)
+    points_input = discord.ui.TextInput(label="Points to Withdraw (min 1000)", placeholder="e.g., 1000")
+
+    def __init__(self, current_points: int):
+        super().__init__()
+        self.current_points = current_points
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            points_to_withdraw = int(self.points_input.value)
+            if points_to_withdraw <= 0:
+                await interaction.response.send_message("⚠️ Please enter a valid number of points.", ephemeral=True)
+                return
+            if points_to_withdraw < 1000:
+                await interaction.response.send_message("🚫 The minimum withdrawal amount is **1000 points**.", ephemeral=True)
+                return
+        except ValueError:
+            await interaction.response.send_message("⚠️ Please enter a valid number of points.", ephemeral=True)
+            return
+
+        # Deduct and record in one atomic statement: the UPDATE only matches
+        # when the balance still covers the amount, and the INSERT only fires
+        # when the UPDATE matched. No gap between check and deduction, so two
+        # concurrent submits can't both spend the same points.
+        async with db_pool.acquire() as conn:
+            withdrawal_id = await conn.fetchval("""
+                WITH deducted AS (
+                    UPDATE users SET points = points - $1
+                    WHERE user_id = $2 AND points >= $1
+                    RETURNING user_id
+                )
+                INSERT INTO withdrawals (user_id, bank_name, account_number, account_name, points, status)
+                SELECT user_id, $3, $4, $5, $1, 'pending' FROM deducted
+                RETURNING id
+            """, points_to_withdraw, interaction.user.id, self.bank_name_input.value, self.account_number_input.value, self.account_name_input.value)
+
+        invalidate_points(interaction.user.id)
+
+        if withdrawal_id is None:
+            await interaction.response.send_message(f"🚫 You only have {await get_user_points(interaction.user.id)} points. You can't withdraw more than you have!", ephemeral=True)
+            return
+
+        await interaction.response.send_message(f"✅ Withdrawal request for **{points_to_withdraw} points** sent! Your new balance is **{self.current_points - points_to_withdraw} points**.", ephemeral=True)
+
+        await _announce_withdrawal(interaction.user.id, points_to_withdraw, withdrawal_id)
+
+
 @bot.command(name="profile")
 async def profile_cmd(ctx, member: Optional[discord.Member] = None):
     member = member or ctx.author
-    await ensure_user(member.id)
-
-    pts = await get_user_points(member.id)
 
+    # Share one connection across the upsert and the stat counts; conditional
+    # aggregation returns all four counters in a single round trip.
     async with db_pool.acquire() as conn:
-        total_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM submissions WHERE user_id=$1", member.id)
-        approved_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM submissions WHERE user_id=$1 AND status='approved'", member.id)
-        rejected_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM submissions WHERE user_id=$1 AND status='rejected'", member.id)
-        total_completed_tasks_row = await conn.fetchrow(
-            "SELECT COUNT(*) AS cnt FROM submissions WHERE user_id = $1 AND status IN ('approved', 'rejected')",
-            member.id
-        )
+        pts = await ensure_and_get_points(member.id, conn)
+        stats = await conn.fetchrow("""
+            SELECT COUNT(*) AS total,
+                   COUNT(*) FILTER (WHERE status='approved') AS approved,
+                   COUNT(*) FILTER (WHERE status='rejected') AS rejected,
+                   COUNT(*) FILTER (WHERE status IN ('approved','rejected')) AS completed
+            FROM submissions WHERE user_id=$1
+        """, member.id)
 
-    total = total_row['cnt'] if total_row else 0
-    approved = approved_row['cnt'] if approved_row else 0
-    rejected = rejected_row['cnt'] if rejected_row else 0
-    total_completed_tasks = total_completed_tasks_row['cnt'] if total_completed_tasks_row else 0
+    total = stats['total']
+    approved = stats['approved']
+    rejected = stats['rejected']
+    total_completed_tasks = stats['completed']
 
 
     profile_embed = discord.Embed(title=f"{member.display_name}'s Profile", color=0x00E676)
@@ -643,140 +1231,15 @@ async def profile_cmd(ctx, member: Optional[discord.Member] = None):
     if ctx.author.id == member.id:
         withdraw_button = Button(label="💰 Withdraw Points", style=discord.ButtonStyle.success)
         async def withdraw_cb(interaction: discord.Interaction):
-            
             current_points = await get_user_points(interaction.user.id)
             if current_points < 1000:
                 await interaction.response.send_message("🚫 You must have at least **1000 points** to withdraw.", ephemeral=True)
                 return
 
-            await interaction.response.send_message("Let's process your withdrawal. What is your **Bank Name**?", ephemeral=True)
-            
-            details = {}
-            
-            def check(msg): return msg.author == interaction.user and msg.channel == interaction.channel
+            await interaction.response.send_modal(WithdrawalModal(current_points))
 
-            try:
-                bank_name_msg = await bot.wait_for("message", check=check, timeout=60.0)
-                details['bank_name'] = bank_name_msg.content
-                await bank_name_msg.delete(delay=10)
-                
-                await interaction.followup.send("What is your **Account Number**?", ephemeral=True)
-                account_number_msg = await bot.wait_for("message", check=check, timeout=60.0)
-                details['account_number'] = account_number_msg.content
-                await account_number_msg.delete(delay=10)
-
-                await interaction.followup.send("What is your **Account Name**?", ephemeral=True)
-                account_name_msg = await bot.wait_for("message", check=check, timeout=60.0)
-                details['account_name'] = account_name_msg.content
-                await account_name_msg.delete(delay=10)
-
-                await interaction.followup.send("How many **points** do you want to withdraw? (Minimum 1000)", ephemeral=True)
-                points_msg = await bot.wait_for("message", check=check, timeout=60.0)
-                details['points'] = points_msg.content
-                await points_msg.delete(delay=10)
-
-            except asyncio.TimeoutError:
-                await interaction.followup.send("⌛ Withdrawal process timed out. Please try again.", ephemeral=True)
-                return
-
-            try:
-                points_to_withdraw = int(details['points'])
-                if points_to_withdraw <= 0:
-                    await interaction.followup.send("⚠️ Please enter a valid number of points.", ephemeral=True)
-                    return
-                if points_to_withdraw < 1000:
-                    await interaction.followup.send("🚫 The minimum withdrawal amount is **1000 points**.", ephemeral=True)
-                    return
-
-            except ValueError:
-                await interaction.followup.send("⚠️ Please enter a valid number of points.", ephemeral=True)
-                return
-
-            if points_to_withdraw > current_points:
-                await interaction.followup.send(f"🚫 You only have {current_points} points. You can't withdraw more than you have!", ephemeral=True)
-                return
-            
-            async with db_pool.acquire() as conn:
-                await conn.execute("UPDATE users SET points = points - $1 WHERE user_id=$2", points_to_withdraw, interaction.user.id)
-
-                row = await conn.fetchrow(
-                    "INSERT INTO withdrawals (user_id, bank_name, account_number, account_name, points, status) VALUES ($1, $2, $3, $4, $5, $6) RETURNING id",
-                    interaction.user.id, details['bank_name'], details['account_number'], details['account_name'], points_to_withdraw, 'pending'
-                )
-                withdrawal_id = row['id']
-
-            await interaction.followup.send(f"✅ Withdrawal request for **{points_to_withdraw} points** sent! Your new balance is **{current_points - points_to_withdraw} points**.", ephemeral=True)
-
-            announce_channel = bot.get_channel(WITHDRAWAL_CHANNEL_ID)
-            if announce_channel:
-                try:
-                    embed = discord.Embed(
-                        title="💰 New Withdrawal Request",
-                        description=f"A new withdrawal request has been submitted by <@{interaction.user.id}>.",
-                        color=0xFFD700
-                    )
-                    embed.add_field(name="Points", value=str(points_to_withdraw), inline=True)
-                    embed.add_field(name="Status", value="Pending", inline=True)
-                    embed.set_footer(text=f"Request ID: {withdrawal_id}")
-                    
-                    admin_view = View()
-                    view_details_btn = Button(label="View Details", style=discord.ButtonStyle.primary)
-                    approve_btn = Button(label="✅ Approve", style=discord.ButtonStyle.success)
-                    
-                    async def view_details_cb(admin_inter: discord.Interaction):
-                        if not admin_inter.user.guild_permissions.administrator:
-                            await admin_inter.response.send_message("⛔ You must be an administrator to view this.", ephemeral=True)
-                            return
-                        
-                        async with db_pool.acquire() as conn:
-                            row = await conn.fetchrow("SELECT * FROM withdrawals WHERE id=$1", withdrawal_id)
-                        
-                        if not row:
-                            await admin_inter.response.send_message("⚠️ Withdrawal request not found.", ephemeral=True)
-                            return
-                            
-                        details_embed = discord.Embed(title=f"Withdrawal Request #{withdrawal_id} Details", color=0x00B8FF)
-                        details_embed.add_field(name="User", value=f"<@{row['user_id']}>", inline=False)
-                        details_embed.add_field(name="Points", value=str(row['points']), inline=False)
-                        details_embed.add_field(name="Bank Name", value=row['bank_name'], inline=False)
-                        details_embed.add_field(name="Account Name", value=row['account_name'], inline=False)
-                        details_embed.add_field(name="Account Number", value=row['account_number'], inline=False)
-                        details_embed.add_field(name="Status", value=row['status'], inline=False)
-                        
-                        await admin_inter.response.send_message(embed=details_embed, ephemeral=True)
-
-                    async def approve_withdrawal_cb(admin_inter: discord.Interaction):
-                        if not admin_inter.user.guild_permissions.administrator:
-                            await admin_inter.response.send_message("⛔ You must be an administrator to approve this.", ephemeral=True)
-                            return
-                        
-                        async with db_pool.acquire() as conn:
-                            await conn.execute("UPDATE withdrawals SET status='completed' WHERE id=$1", withdrawal_id)
-                        
-                        approved_embed = discord.Embed(
-                            title="✅ Withdrawal Approved",
-                            description=f"Request **#{withdrawal_id}** for **{points_to_withdraw} points** has been approved.",
-                            color=0x00CC66
-                        )
-                        approved_embed.set_footer(text=f"Approved by {admin_inter.user.display_name}")
-                        
-                        admin_view.children[0].disabled = True
-                        admin_view.children[1].disabled = True
-                        
-                        await admin_inter.response.edit_message(embed=approved_embed, view=admin_view)
-
-                    view_details_btn.callback = view_details_cb
-                    approve_btn.callback = approve_withdrawal_cb
-                    
-                    admin_view.add_item(view_details_btn)
-                    admin_view.add_item(approve_btn)
-
-                    await announce_channel.send(embed=embed, view=admin_view)
-                except Exception as e:
-                    print(f"Error sending withdrawal notification to channel {WITHDRAWAL_CHANNEL_ID}: {e}")
-    
-    withdraw_button.callback = withdraw_cb
-    main_profile_view.add_item(withdraw_button)
+        withdraw_button.callback = withdraw_cb
+        main_profile_view.add_item(withdraw_button)
     
     if total_completed_tasks > 0:
         next_btn = Button(label="➡️ View Task History", style=discord.ButtonStyle.primary)
@@ -799,31 +1262,43 @@ async def profile_cmd(ctx, member: Optional[discord.Member] = None):
 # ---- Public: Leaderboard ----
 @bot.command(name="leaderboard")
 async def leaderboard(ctx: commands.Context, limit: int = 10):
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch(
-            "SELECT user_id, points FROM users ORDER BY points DESC LIMIT $1",
-            limit
-        )
+    # Top N and the caller's own rank in a single round trip against the
+    # precomputed leaderboard view.
+    lb_rows = await db_pool.fetch("""
+        SELECT 'top' AS kind, user_id, points, rank
+        FROM (SELECT user_id, points, rank FROM leaderboard_mv ORDER BY rank LIMIT $1) t
+        UNION ALL
+        SELECT 'me' AS kind, user_id, points, rank FROM leaderboard_mv WHERE user_id=$2
+    """, limit, ctx.author.id)
+
+    rows = [r for r in lb_rows if r['kind'] == 'top']
+    me = next((r for r in lb_rows if r['kind'] == 'me'), None)
 
     if not rows:
         await ctx.send("⚠️ No users yet.")
         return
 
-    medals = ["🥇", "🥈", "🥉"]
+    # Resolve every name in one gateway request instead of a per-row
+    # get_member that falls through to nothing for uncached members.
+    members = {}
+    missing = [r["user_id"] for r in rows if not ctx.guild.get_member(r["user_id"])]
+    if missing:
+        try:
+            fetched = await ctx.guild.query_members(user_ids=missing, limit=len(missing), cache=True)
+            members = {m.id: m for m in fetched}
+        except Exception as e:
+            log.exception("leaderboard member lookup failed: %s", e)
+
     lines = []
 
     for i, r in enumerate(rows, start=1):
-        user = ctx.guild.get_member(r["user_id"]) or bot.get_user(r["user_id"])
+        user = ctx.guild.get_member(r["user_id"]) or members.get(r["user_id"]) or bot.get_user(r["user_id"])
         name = user.display_name if hasattr(user, "display_name") else (user.name if user else f"User {r['user_id']}")
-        emoji = medals[i - 1] if i <= len(medals) else f"#{i}"
+        emoji = _MEDALS[i - 1] if i <= len(_MEDALS) else f"#{i}"
         lines.append(f"{emoji} **{name}** — {r['points']} pts")
     
-    # Get the user's rank and points
-    async with db_pool.acquire() as conn:
-        user_rows = await conn.fetch("SELECT user_id, points FROM users ORDER BY points DESC")
-    
-    rank = next((i + 1 for i, rr in enumerate(user_rows) if rr["user_id"] == ctx.author.id), None)
-    user_points = next((rr["points"] for rr in user_rows if rr["user_id"] == ctx.author.id), 0)
+    rank = me['rank'] if me else None
+    user_points = me['points'] if me else 0
 
     embed = discord.Embed(
         title="🏆 Quest Leaderboard",
@@ -848,60 +1323,106 @@ async def leaderboard(ctx: commands.Context, limit: int = 10):
     embed.set_footer(text="Keep grinding those quests 💪")
     await ctx.send(embed=embed)
 
+# Rank/medal and progress-bar strings are a closed set — build them once at
+# import (same trick as _BAR_W12) instead of concatenating per render.
+_MEDALS = ("🥇", "🥈", "🥉")
+_BARS = tuple("▰" * i + "▱" * (10 - i) for i in range(11))
+
+
 # ---- Review dashboard & review commands ----
 def progress_bar(current, total, length=10):
     if total == 0:
         return "▱" * length
-    filled = int(length * current / max(1, total))
+    # Floor division keeps this in pure integer arithmetic — no float
+    # multiply/truncate round trip; the clamp covers current > total.
+    filled = (length * current) // max(1, total)
+    if filled > length:
+        filled = length
+    elif filled < 0:
+        filled = 0
+    if length == 10:
+        return _BARS[filled]
     return "▰" * filled + "▱" * (length - filled)
 
+# Several admins can have dashboards auto-refreshing at once; a short memo
+# lets them share one query. Anything that changes the review queue calls
+# invalidate_review_embed, which also wakes the auto-refresh loops below
+# so dashboards re-render on change instead of polling blindly.
+_REVIEW_EMBED_TTL = 15.0   # seconds
+_review_embed_cache: Optional[tuple] = None   # (monotonic stamp, embed)
+_review_embed_lock = asyncio.Lock()
+REVIEW_DIRTY = asyncio.Event()
+
+# The "all clear" embed is pure constant — build it once and hand out copies
+# so the steady state (empty queue) skips Embed construction entirely.
+_EMPTY_REVIEW_EMBED = discord.Embed(
+    title="🎯 Review Queue Dashboard",
+    description="🎉 All clear! No pending submissions. Great job, mods 🚀",
+    color=0x00CC66
+)
+
+
+def invalidate_review_embed() -> None:
+    global _review_embed_cache
+    _review_embed_cache = None
+    REVIEW_DIRTY.set()
+
+
 async def build_review_embed():
-    async with db_pool.acquire() as conn:
-        rows = await conn.fetch("""
-            SELECT 
-                t.title,
-                t.id,
-                COUNT(s.id) AS pending_count
-            FROM tasks t
-            LEFT JOIN submissions s ON s.task_id = t.id AND s.status='pending'
-            GROUP BY t.id
-            HAVING COUNT(s.id) > 0
-        """)
-
-        if not rows:
-            embed = discord.Embed(
-                title="🎯 Review Queue Dashboard",
-                description="🎉 All clear! No pending submissions. Great job, mods 🚀",
-                color=0x00CC66
-            )
-            return embed
+    global _review_embed_cache
+    cached = _review_embed_cache
+    if cached and monotonic() - cached[0] < _REVIEW_EMBED_TTL:
+        return cached[1]
+    async with _review_embed_lock:
+        cached = _review_embed_cache
+        if cached and monotonic() - cached[0] < _REVIEW_EMBED_TTL:
+            return cached[1]
+        embed = await _build_review_embed_uncached()
+        _review_embed_cache = (monotonic(), embed)
+        return embed
 
-        lines = []
-        medal = ["🥇", "🥈", "🥉"]
-        # Convert rows (list of asyncpg.Record) to a standard list of dicts for sorting
-        sorted_rows = sorted(rows, key=lambda r: r['pending_count'], reverse=True)
 
-        for i, r in enumerate(sorted_rows):
-            total_submissions_row = await conn.fetchrow(
-                "SELECT COUNT(*) AS cnt FROM submissions WHERE task_id=$1",
-                r['id']
-            )
-            total_submissions_for_task = total_submissions_row['cnt'] if total_submissions_for_task else 0
+async def _build_review_embed_uncached():
+    # Pending and total counts per task in one aggregated pass, already
+    # sorted — no per-task count query and no Python-side re-sort.
+    rows = await db_pool.fetch("""
+        SELECT
+            t.id,
+            t.title,
+            COUNT(s.id) FILTER (WHERE s.status='pending') AS pending_count,
+            COUNT(s.id) AS total_count
+        FROM tasks t
+        LEFT JOIN submissions s ON s.task_id = t.id
+        GROUP BY t.id
+        HAVING COUNT(s.id) FILTER (WHERE s.status='pending') > 0
+        ORDER BY pending_count DESC
+        LIMIT 10
+    """)
 
-            bar = progress_bar(r['pending_count'], total_submissions_for_task)
-            emoji = medal[i] if i < len(medal) else "🔸"
-            lines.append(
-                f"{emoji} **{r['title']}**\n"
-                f"Pending: `{r['pending_count']}` / {total_submissions_for_task} {bar}"
-            )
+    if not rows:
+        return _EMPTY_REVIEW_EMBED.copy()
 
-        embed = discord.Embed(
-            title="🎯 Review Queue Dashboard",
-            description="\n\n".join(lines),
-            color=0xFF4500
+    lines = []
+    for i, r in enumerate(rows):
+        bar = progress_bar(r['pending_count'], r['total_count'])
+        emoji = _MEDALS[i] if i < len(_MEDALS) else "🔸"
+        lines.append(
+            f"{emoji} **{r['title']}**\n"
+            f"Pending: `{r['pending_count']}` / {r['total_count']} {bar}"
         )
-        embed.set_footer(text="Keep the reviews flowing, admins! 💪")
-        return embed
+
+    embed = discord.Embed(
+        title="🎯 Review Queue Dashboard",
+        description="\n\n".join(lines),
+        color=0xFF4500
+    )
+    embed.set_footer(text="Keep the reviews flowing, admins! 💪")
+    return embed
+
+# One auto-refresh task per channel; re-running !reviewstats replaces the
+# previous panel's loop instead of leaking another one forever.
+_review_refreshers: dict[int, asyncio.Task] = {}
+
 
 @bot.command(name="reviewstats")
 @commands.has_permissions(administrator=True)
@@ -923,28 +1444,43 @@ async def review_stats(ctx: commands.Context):
     async def auto_refresh():
         try:
             while True:
-                await asyncio.sleep(30)
+                # Wake on actual queue changes; the timeout is just a
+                # five-minute heartbeat for anything that slipped past the
+                # invalidation hooks.
+                try:
+                    await asyncio.wait_for(REVIEW_DIRTY.wait(), timeout=300)
+                    REVIEW_DIRTY.clear()
+                except asyncio.TimeoutError:
+                    pass
                 new_embed = await build_review_embed()
                 try:
                     await msg.edit(embed=new_embed, view=view)
                 except Exception:
                     pass
+        except asyncio.CancelledError:
+            pass   # superseded by a newer panel in this channel
         except Exception as e:
-            print(f"[AutoRefresh stopped] {e}")
+            log.exception("AutoRefresh stopped: %s", e)
 
-    # Use a safe way to check if the task is already running, though for this example, creating it once is fine.
-    bot.loop.create_task(auto_refresh())
+    prev = _review_refreshers.get(ctx.channel.id)
+    if prev is not None:
+        prev.cancel()
+    _review_refreshers[ctx.channel.id] = bot.loop.create_task(auto_refresh())
 
 @bot.command(name="review")
 @commands.has_permissions(administrator=True)
 async def review_cmd(ctx: commands.Context):
     async with db_pool.acquire() as conn:
+        # Grab everything the detail view needs up front (except proof
+        # bodies, which stay server-side until one row is opened) so the
+        # select callback doesn't redo the join per click.
         subs = await conn.fetch(
             """
-            SELECT s.id, s.user_id, s.proof, s.task_id, t.title
-            FROM submissions s 
+            SELECT s.id, s.user_id, s.task_id, t.title, t.points AS task_points
+            FROM submissions s
             JOIN tasks t ON s.task_id = t.id
-            WHERE s.status='pending' 
+            WHERE s.status='pending'
+            ORDER BY s.id
             LIMIT 25
             """
         )
@@ -953,13 +1489,15 @@ async def review_cmd(ctx: commands.Context):
         await ctx.send("🎉 No pending submissions.")
         return
 
-    options = [
-        discord.SelectOption(
-            label=f"#{r['id']} | {r['title']} from {ctx.guild.get_member(r['user_id']).display_name if ctx.guild.get_member(r['user_id']) else r['user_id']}",
+    rows_by_id = {r['id']: r for r in subs}
+
+    options = []
+    for r in subs:
+        m = ctx.guild.get_member(r['user_id'])
+        options.append(discord.SelectOption(
+            label=f"#{r['id']} | {r['title']} from {m.display_name if m else r['user_id']}",
             value=str(r["id"])
-        )
-        for r in subs
-    ]
+        ))
 
     class PendingSelect(Select):
         def __init__(self, **kwargs):
@@ -967,15 +1505,13 @@ async def review_cmd(ctx: commands.Context):
         
         async def callback(self, interaction: discord.Interaction):
             sid = int(self.values[0])
-            async with db_pool.acquire() as conn:
-                row = await conn.fetchrow("""
-                    SELECT s.*, t.title, t.points AS task_points
-                    FROM submissions s
-                    JOIN tasks t ON s.task_id = t.id
-                    WHERE s.id=$1
-                """, sid)
-            
-            if not row or row['status'] != 'pending':
+            row = rows_by_id.get(sid)
+            # Only the volatile bits hit the DB now: a fresh status check
+            # (another admin may have just resolved it) and the proof body
+            # the list query deliberately left behind. No join, no s.*.
+            live = await db_pool.fetchrow("SELECT status, proof FROM submissions WHERE id=$1", sid)
+
+            if not row or not live or live['status'] != 'pending':
                 await interaction.response.send_message("Submission is no longer pending or not found.", ephemeral=True)
                 return
 
@@ -984,9 +1520,9 @@ async def review_cmd(ctx: commands.Context):
             embed.add_field(name="Task ID", value=f"#{row['task_id']}", inline=True)
 
             file = None
-            
+
             # Since local file storage is removed, we only display the link.
-            proof_link = row["proof"]
+            proof_link = live["proof"]
             if proof_link and proof_link.startswith(("http://", "https://")):
                 embed.add_field(name="Proof", value=f"Proof link: [Click Here]({proof_link})", inline=False)
             else:
@@ -999,33 +1535,66 @@ async def review_cmd(ctx: commands.Context):
                 task_points = row['task_points']
                 user_id = row['user_id']
 
-                async with db_pool.acquire() as conn:
-                    # Perform both updates in the same block for efficiency/atomicity
-                    await conn.execute("UPDATE submissions SET status='approved', reviewed_at=CURRENT_TIMESTAMP WHERE id=$1", sid)
-                    await conn.execute("UPDATE users SET points = points + $1 WHERE user_id=$2", task_points, user_id)
-                
-                notification_channel = bot.get_channel(NOTIFICATION_CHANNEL_ID)
-                if notification_channel:
+                async def do_update():
+                    # Explicit transaction: one BEGIN/COMMIT pair no matter how
+                    # many statements this handler grows (audit inserts, etc.).
+                    async with db_pool.acquire() as conn, conn.transaction():
+                        # One statement flips the submission and credits the user
+                        # atomically; RETURNING hands back the fresh balance. The
+                        # award only happens when the submission row was actually
+                        # updated, so a vanished submission can't still pay out.
+                        return await conn.fetchval("""
+                            WITH s AS (
+                                UPDATE submissions SET status='approved', reviewed_at=CURRENT_TIMESTAMP
+                                WHERE id=$1
+                                RETURNING user_id
+                            )
+                            UPDATE users SET points = points + $2
+                            FROM s WHERE users.user_id = s.user_id
+                            RETURNING users.points
+                        """, sid, task_points)
+
+                async def notify():
+                    notification_channel = getattr(bot, "_notif_channel", None)
+                    if not notification_channel:
+                        return
                     try:
-                        task_title = await task_title_by_id(row['task_id'])
-                        await notification_channel.send(f"🎉 Hey <@{user_id}>, your submission for **{task_title}** has been **approved**! You earned **{task_points}** points. 🏆")
+                        # The review row already joined the task title, so the
+                        # message needs nothing beyond the write confirming.
+                        await notification_channel.send(f"🎉 Hey <@{user_id}>, your submission for **{row['title']}** has been **approved**! You earned **{task_points}** points. 🏆")
                     except Exception as e:
-                        print(f"Error sending approval notification: {e}")
-                
-                await btn_inter.response.edit_message(content=f"✅ Approved submission #{sid} and awarded {task_points} points to <@{user_id}>.", view=None, embed=None)
+                        log.exception("Error sending approval notification: %s", e)
+
+                # The write confirms first: the CTE returns NULL when the
+                # submission row vanished, and nobody should be told they
+                # earned points that were never credited.
+                new_pts = await do_update()
+                invalidate_review_embed()
+                if new_pts is None:
+                    invalidate_points(user_id)
+                    await btn_inter.response.edit_message(content=f"⚠️ Submission #{sid} no longer exists — nothing was awarded.", view=None, embed=None)
+                    return
+                _points_cache[user_id] = (monotonic(), new_pts)
+
+                # The public notification and the reviewer's edit are still
+                # independent Discord calls — overlap those two.
+                await asyncio.gather(
+                    notify(),
+                    btn_inter.response.edit_message(content=f"✅ Approved submission #{sid} and awarded {task_points} points to <@{user_id}>.", view=None, embed=None),
+                )
 
             async def reject_cb(btn_inter: discord.Interaction):
                 user_id = row['user_id']
-                async with db_pool.acquire() as conn:
+                async with db_pool.acquire() as conn, conn.transaction():
                     await conn.execute("UPDATE submissions SET status='rejected', reviewed_at=CURRENT_TIMESTAMP WHERE id=$1", sid)
+                invalidate_review_embed()
 
-                notification_channel = bot.get_channel(NOTIFICATION_CHANNEL_ID)
+                notification_channel = getattr(bot, "_notif_channel", None)
                 if notification_channel:
                     try:
-                        task_title = await task_title_by_id(row['task_id'])
-                        await notification_channel.send(f"❌ <@{user_id}>, your submission for **{task_title}** has been **rejected**. Please check the task details and try again.")
+                        await notification_channel.send(f"❌ <@{user_id}>, your submission for **{row['title']}** has been **rejected**. Please check the task details and try again.")
                     except Exception as e:
-                        print(f"Error sending rejection notification: {e}")
+                        log.exception("Error sending rejection notification: %s", e)
 
                 await btn_inter.response.edit_message(content=f"❌ Rejected submission #{sid}.", view=None, embed=None)
 
@@ -1070,20 +1639,29 @@ class AddTaskModal(discord.ui.Modal, title="Add a New Quest"):
                     self.title_input.value, points, max_subs, ttype, self.link_input.value
                 )
                 tid = row['id']
-            
+
+            TASKS[tid] = {
+                'id': tid, 'title': self.title_input.value, 'points': points,
+                'max_submissions': max_subs, 'archived': 0, 'role_reward_id': None,
+                'daily_flag': 0, 'type': ttype, 'task_link': self.link_input.value,
+                'announcement_message_id': None,
+            }
+            bump_board_version()
+
             await interaction.response.send_message("✅ Quest added successfully! Announcing now...", ephemeral=True)
             
-            announce_channel = bot.get_channel(ANNOUNCEMENT_CHANNEL_ID)
+            announce_channel = getattr(bot, "_announce_channel", None)
             if announce_channel:
                 announcement_msg = await announce_channel.send(f"@everyone, a new task has just dropped! ({self.title_input.value} | {points} points)\n(Type `!tasks` to view the task and submit proof)")
                 
                 async with db_pool.acquire() as conn:
                     await conn.execute("UPDATE tasks SET announcement_message_id=$1 WHERE id=$2", announcement_msg.id, tid)
+                TASKS[tid]['announcement_message_id'] = announcement_msg.id
 
         except ValueError:
             await interaction.response.send_message("⚠️ Please enter valid numbers for points and max submissions, and a valid type (link/like/rt).", ephemeral=True)
         except Exception as e:
-            print(f"Error adding task: {e}")
+            log.exception("Error adding task: %s", e)
             if not interaction.response.is_done():
                 await interaction.response.send_message(f"❌ An error occurred: {e}", ephemeral=True)
 
@@ -1096,7 +1674,8 @@ class BanUserModal(discord.ui.Modal, title="Ban a User from Submitting Quests"):
             user_id = int(self.user_id_input.value)
             async with db_pool.acquire() as conn:
                 await conn.execute("INSERT INTO banned_users (user_id) VALUES ($1) ON CONFLICT (user_id) DO NOTHING", user_id)
-            
+
+            BANNED.add(user_id)
             await interaction.response.send_message(f"✅ User ID `{user_id}` has been banned from submitting quests.", ephemeral=True)
         except ValueError:
             await interaction.response.send_message("⚠️ Please enter a valid user ID (numbers only).", ephemeral=True)
@@ -1105,25 +1684,33 @@ class BanUserModal(discord.ui.Modal, title="Ban a User from Submitting Quests"):
 
 # --- VIEWS ---
 class AdminDashboardView(discord.ui.View):
-    def __init__(self, *, timeout=180):
-        super().__init__(timeout=timeout)
+    """Persistent dashboard: stable custom_ids let one registered instance
+    serve every invocation, and the buttons keep working after a restart
+    instead of dying on the old 180s timeout."""
+
+    def __init__(self):
+        super().__init__(timeout=None)
 
-    @discord.ui.button(label="📝 Add Quest", style=discord.ButtonStyle.success, emoji="➕")
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # The view now outlives the invoking command, so gate clicks here.
+        return interaction.user.guild_permissions.administrator
+
+    @discord.ui.button(label="📝 Add Quest", style=discord.ButtonStyle.success, emoji="➕", custom_id="admin:add_task")
     async def add_task_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_modal(AddTaskModal())
     
-    @discord.ui.button(label="🔎 Review Submissions", style=discord.ButtonStyle.primary, emoji="📋")
+    @discord.ui.button(label="🔎 Review Submissions", style=discord.ButtonStyle.primary, emoji="📋", custom_id="admin:review")
     async def review_tasks_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True, thinking=True)
         # Bug Fix: Correctly call the review_cmd function
         ctx = await bot.get_context(interaction.message)
         await review_cmd(ctx)
         
-    @discord.ui.button(label="⛔ Ban User", style=discord.ButtonStyle.danger, emoji="🚫")
+    @discord.ui.button(label="⛔ Ban User", style=discord.ButtonStyle.danger, emoji="🚫", custom_id="admin:ban")
     async def ban_user_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.send_modal(BanUserModal())
 
-    @discord.ui.button(label="✍️ Edit/Remove Quests", style=discord.ButtonStyle.secondary, emoji="⚙️")
+    @discord.ui.button(label="✍️ Edit/Remove Quests", style=discord.ButtonStyle.secondary, emoji="⚙️", custom_id="admin:manage")
     async def manage_tasks_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         async with db_pool.acquire() as conn:
             tasks = await conn.fetch("SELECT id, title FROM tasks WHERE archived=0")
@@ -1147,6 +1734,9 @@ class AdminDashboardView(discord.ui.View):
 
         await interaction.response.send_message("Select a quest to manage from the list below:", view=view, ephemeral=True)
 
+# One instance serves every dashboard message and the startup add_view call.
+_ADMIN_VIEW = AdminDashboardView()
+
 class ManageTaskView(discord.ui.View):
     def __init__(self, task_id: int, *, timeout=180):
         super().__init__(timeout=timeout)
@@ -1159,6 +1749,9 @@ class ManageTaskView(discord.ui.View):
             await conn.execute("DELETE FROM submissions WHERE task_id=$1", self.task_id)
             await conn.execute("DELETE FROM tasks WHERE id=$1", self.task_id)
 
+        TASKS.pop(self.task_id, None)
+        bump_board_version()
+        invalidate_review_embed()
         await interaction.response.edit_message(content=f"✅ Quest #{self.task_id} and all its submissions have been removed.", view=None)
 
     @discord.ui.button(label="📦 Archive Quest", style=discord.ButtonStyle.secondary, emoji="📁")
@@ -1166,6 +1759,9 @@ class ManageTaskView(discord.ui.View):
         async with db_pool.acquire() as conn:
             await conn.execute("UPDATE tasks SET archived=1 WHERE id=$1", self.task_id)
 
+        if self.task_id in TASKS:
+            TASKS[self.task_id]['archived'] = 1
+        bump_board_version()
         await interaction.response.edit_message(content=f"✅ Quest #{self.task_id} has been archived and is no longer visible on the board.", view=None)
     
     @discord.ui.button(label="✏️ Edit Quest", style=discord.ButtonStyle.primary, emoji="📝")
@@ -1195,7 +1791,14 @@ class ManageTaskView(discord.ui.View):
                             "UPDATE tasks SET title=$1, points=$2, max_submissions=$3, type=$4, task_link=$5 WHERE id=$6",
                             self.children[0].value, points, max_subs, ttype, self.children[4].value, self.task_id
                         )
-                    
+
+                    if self.task_id in TASKS:
+                        TASKS[self.task_id].update(
+                            title=self.children[0].value, points=points,
+                            max_submissions=max_subs, type=ttype,
+                            task_link=self.children[4].value,
+                        )
+                    bump_board_version()
                     await interaction.response.edit_message(content=f"✅ Quest #{self.task_id} has been updated.", view=None)
                 except ValueError:
                     await interaction.response.send_message("⚠️ Please enter valid numbers for points and max submissions.", ephemeral=True)
@@ -1210,16 +1813,24 @@ class ManageTaskView(discord.ui.View):
 @bot.command(name="admindashboard")
 @commands.has_permissions(administrator=True)
 async def admin_dashboard_cmd(ctx: commands.Context):
-    async with db_pool.acquire() as conn:
-        pending_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM submissions WHERE status='pending'")
-        total_tasks_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM tasks")
-        total_users_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM users")
-        banned_users_row = await conn.fetchrow("SELECT COUNT(*) AS cnt FROM banned_users")
-
-    pending_submissions = pending_row['cnt'] if pending_row else 0
-    total_tasks = total_tasks_row['cnt'] if total_tasks_row else 0
-    total_users = total_users_row['cnt'] if total_users_row else 0
-    banned_users = banned_users_row['cnt'] if banned_users_row else 0
+    # Four counters, one round trip. Only the pending count needs to be
+    # exact (it drives review work); the table totals are dashboard flavor,
+    # so the planner's reltuples estimates are plenty and skip full scans as
+    # those tables grow. The oid lookup pins each estimate to our schema's
+    # table — bare relname matches once per schema, and e.g. Supabase always
+    # has auth.users next to public.users. GREATEST covers the -1 sentinel
+    # on never-analyzed tables; COALESCE covers a missing relation.
+    counts = await db_pool.fetchrow("""
+        SELECT
+            (SELECT COUNT(*) FROM submissions WHERE status='pending') AS pending,
+            COALESCE((SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass('public.tasks')), 0) AS tasks,
+            COALESCE((SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass('public.users')), 0) AS users,
+            COALESCE((SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = to_regclass('public.banned_users')), 0) AS banned
+    """)
+    pending_submissions = counts['pending']
+    total_tasks = counts['tasks']
+    total_users = counts['users']
+    banned_users = counts['banned']
 
     embed = discord.Embed(
         title="🛠️ Admin Dashboard",
@@ -1230,39 +1841,46 @@ async def admin_dashboard_cmd(ctx: commands.Context):
     embed.add_field(name="✅ Total Quests", value=f"**{total_tasks}**", inline=True)
     embed.add_field(name="🧑‍🤝‍🧑 Active Users", value=f"**{total_users}**", inline=True)
     embed.add_field(name="🚫 Banned Users", value=f"**{banned_users}**", inline=True)
-    await ctx.send(embed=embed, view=AdminDashboardView())
+    await ctx.send(embed=embed, view=_ADMIN_VIEW)
 
 # -------------------------
 # 🌐 Web Server for Keep-Alive (FREE TIER ONLY)
 # -------------------------
-# The imports for Flask and Thread are moved to the top of the file for cleanliness.
+# aiohttp serves the pinger endpoint from the bot's own event loop — no
+# second thread, no WSGI dev server, and a handler this trivial never
+# blocks the loop for meaningful time.
 
-# Create the Flask app
-app = Flask(__name__)
-
-@app.route('/')
-def home():
+async def _keep_alive_handler(request: web.Request) -> web.Response:
     """A simple endpoint for the external pinger to hit."""
-    return "Bot is alive and running!"
+    return web.Response(text="Bot is alive and running!")
 
-def run_flask_server():
-    """Start Flask in a separate thread."""
+async def start_keep_alive_server():
     # Note: We must use 0.0.0.0 and the port specified by Render (usually 8080 or the PORT env var)
     port = int(os.environ.get("PORT", 8080))
-    app.run(host='0.0.0.0', port=port)
+    keep_alive_app = web.Application()
+    keep_alive_app.router.add_get('/', _keep_alive_handler)
+    runner = web.AppRunner(keep_alive_app)
+    await runner.setup()
+    await web.TCPSite(runner, '0.0.0.0', port).start()
+    log.info("Keep-alive server listening on port %d", port)
 
 # -------------------------
 # ▶ Run Bot (UPDATED)
 # -------------------------
 
-# 1. Start the Flask server in a background thread
-t = Thread(target=run_flask_server)
-t.start()
+# The call is intentionally placed outside of the __main__ check in this
+# structure to ensure the web server and bot start on deployment platforms.
+async def main():
+    # Connect the database before logging in so the pool is warm when the
+    # first event fires instead of paying the cold-start cost on a command.
+    await start_keep_alive_server()
+    await init_once()
+    if db_pool is None:
+        # init_db already logged the fatal error; nothing to run without a DB.
+        return
+    await bot.start(TOKEN)
 
-# 2. Start the Discord bot in the main thread
-# The bot.run(TOKEN) call is intentionally placed outside of the __main__ check 
-# in this structure to ensure Flask and bot start on deployment platforms.
-bot.run(TOKEN)
+asyncio.run(main())
 
 # =========================
 # RUN